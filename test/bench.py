@@ -0,0 +1,273 @@
+# =========================================================
+# Mini TPU Benchmark
+# =========================================================
+# Fixed workloads timed per phase (reset/load/run/store/check/log).
+#
+#   make -B MODULE=bench VCD=no
+#
+# Each workload runs once as warm-up, then BENCH_REPEAT times (default 5);
+# the median of those runs is reported and compared.
+#
+# Results go to bench_results.json and are appended to bench_history.jsonl.
+# If bench_baseline.json exists, any workload or phase slower than the
+# baseline by more than BENCH_TOLERANCE (default 0.2 = 20%) fails the test.
+# BENCH_SAVE_BASELINE=1 stores the current results as the new baseline.
+# Wall-clock baselines are local to one machine: bench_baseline.json is
+# git-ignored and must not be compared across machines or in CI.
+# BENCH_LOG=1 logs every matrix like test.py does, timed as the "log" phase.
+# A baseline recorded with a different seed, VCD or log setting is not compared.
+#
+# Time spent waiting on simulator triggers is counted as simulator time,
+# everything else (instruction encoding, reference model, checks) as Python.
+import json
+import os
+import random
+import subprocess
+import time
+from contextlib       import contextmanager
+from statistics       import median
+
+import cocotb
+from cocotb.clock     import Clock
+from cocotb.triggers  import RisingEdge
+
+from test             import run_once, matmul_ref, log_matrix
+
+CLK_PERIOD    = 10   # ns
+RESULTS_FILE  = "bench_results.json"
+HISTORY_FILE  = "bench_history.jsonl"
+BASELINE_FILE = "bench_baseline.json"
+PHASES        = ("reset", "load", "run", "store", "check", "log")
+MIN_COMPARE_S = 0.05  # shorter timings are too noisy to compare
+LOG_MATRICES  = os.environ.get("BENCH_LOG", "0") not in ("", "0")
+SETTINGS      = ("seed", "vcd", "log")  # must match the baseline to compare
+
+
+class Profiler:
+    """Wall time per phase, split into Python and simulator time.
+
+    `wait` and `phase` are passed as hooks to the helpers in test.py.
+    """
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.phases = {p: {"wall_s": 0.0, "sim_s": 0.0} for p in PHASES}
+        self.current = None
+        self.cycles = 0   # clock edges waited for; sub-cycle Timers excluded
+
+    @contextmanager
+    def phase(self, name):
+        self.current = self.phases[name]
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current["wall_s"] += time.perf_counter() - t0
+            self.current = None
+
+    async def wait(self, trigger):
+        t0 = time.perf_counter()
+        await trigger
+        self.current["sim_s"] += time.perf_counter() - t0
+        if isinstance(trigger, RisingEdge):
+            self.cycles += 1
+
+    def summary(self):
+        out = {}
+        for name, p in self.phases.items():
+            out[name] = {"wall_s": p["wall_s"], "sim_s": p["sim_s"],
+                         "python_s": p["wall_s"] - p["sim_s"]}
+        return out
+
+
+async def run_case(prof, a, b):
+    return await run_once(prof.dut, a, b, wait=prof.wait, phase=prof.phase)
+
+
+def check(prof, hw, sw):
+    with prof.phase("check"):
+        errors = int(hw != sw)
+    if LOG_MATRICES:
+        with prof.phase("log"):
+            log_matrix(prof.dut, "SW  Result", sw)
+            log_matrix(prof.dut, "HW  Result", hw)
+    return errors
+
+
+# =========================================================
+# Workloads
+# =========================================================
+def rand_matrix(rng, n=4):
+    return [[rng.randint(0, 15) for _ in range(n)] for _ in range(n)]
+
+
+async def wl_single(prof, rng, repeat=8):
+    # the same fixed case repeated, so timings are long enough to compare
+    A = [[1,2,3,4],[5,6,7,8],[9,10,11,12],[13,14,15,16]]
+    B = [[2,0,0,0],[0,3,0,0],[0,0,4,0],[0,0,0,5]]
+    errors = 0
+    for _ in range(repeat):
+        hw, sw = await run_case(prof, A, B)
+        errors += check(prof, hw, sw)
+    return errors
+
+
+async def wl_batched_random(prof, rng, batch=32):
+    errors = 0
+    for _ in range(batch):
+        A, B = rand_matrix(rng), rand_matrix(rng)
+        hw, sw = await run_case(prof, A, B)
+        errors += check(prof, hw, sw)
+    return errors
+
+
+async def wl_tiled_gemm(prof, rng, n=8):
+    # n×n GEMM built from 4×4 tile products, accumulated in Python
+    A, B = rand_matrix(rng, n), rand_matrix(rng, n)
+    C = [[0]*n for _ in range(n)]
+    for i in range(0, n, 4):
+        for j in range(0, n, 4):
+            for k in range(0, n, 4):
+                a = [row[k:k+4] for row in A[i:i+4]]
+                b = [row[j:j+4] for row in B[k:k+4]]
+                hw, _ = await run_case(prof, a, b)
+                with prof.phase("check"):
+                    for r in range(4):
+                        for c in range(4):
+                            C[i+r][j+c] = (C[i+r][j+c] + hw[r][c]) & 0xff
+    with prof.phase("check"):
+        ref = matmul_ref(A, B)
+    return check(prof, C, ref)
+
+
+WORKLOADS = {
+    "single_4x4":     wl_single,
+    "batched_random": wl_batched_random,
+    "tiled_gemm_8x8": wl_tiled_gemm,
+}
+
+
+async def measure(dut, workload, seed):
+    """One timed run of a workload."""
+    prof = Profiler(dut)
+    t0 = time.perf_counter()
+    errors = await workload(prof, random.Random(seed))
+    wall = time.perf_counter() - t0
+
+    phases = prof.summary()
+    sim_s = sum(p["sim_s"] for p in phases.values())
+    return {
+        "wall_s":         wall,
+        "cycles":         prof.cycles,
+        "cycles_per_s":   prof.cycles / wall if wall else 0.0,
+        "sim_s":          sim_s,
+        "python_s":       wall - sim_s,
+        "mismatches":     errors,
+        "phases":         phases,
+    }
+
+
+def median_run(runs):
+    """Median of every timing in `runs`, taken field by field."""
+    out = {k: median(r[k] for r in runs)
+           for k in ("wall_s", "cycles_per_s", "sim_s", "python_s")}
+    out["cycles"] = runs[0]["cycles"]
+    out["phases"] = {p: {k: median(r["phases"][p][k] for r in runs)
+                         for k in runs[0]["phases"][p]}
+                     for p in PHASES}
+    return out
+
+
+# =========================================================
+# Results / Baseline
+# =========================================================
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def find_slowdowns(results, baseline, tolerance):
+    slow = []
+    for name, wl in results["workloads"].items():
+        base = baseline.get("workloads", {}).get(name)
+        if base is None:
+            continue
+        items = [(name, wl["wall_s"], base["wall_s"])]
+        for p in PHASES:
+            if p in base.get("phases", {}):
+                items.append((f"{name}.{p}", wl["phases"][p]["wall_s"],
+                              base["phases"][p]["wall_s"]))
+        for label, now, before in items:
+            if before >= MIN_COMPARE_S and now > before * (1 + tolerance):
+                slow.append(f"{label}: {before:.3f}s -> {now:.3f}s "
+                            f"(+{(now / before - 1) * 100:.0f}%)")
+    return slow
+
+
+# =========================================================
+@cocotb.test()
+async def Bench_TPU(dut):
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD, units="ns").start())
+    dut.ena.value, dut.ui_in.value, dut.uio_in.value = 1, 0, 0
+
+    seed = int(os.environ.get("BENCH_SEED", 1))
+    repeat = max(1, int(os.environ.get("BENCH_REPEAT", 5)))
+    results = {
+        "commit":    git_commit(),
+        "timestamp": time.time(),
+        "seed":      seed,
+        "vcd":       os.environ.get("BENCH_VCD", "1") != "0",
+        "log":       LOG_MATRICES,
+        "repeat":    repeat,
+        "workloads": {},
+    }
+
+    for name, workload in WORKLOADS.items():
+        await measure(dut, workload, seed)       # warm-up, discarded
+        runs = [await measure(dut, workload, seed) for _ in range(repeat)]
+        wl = median_run(runs)
+        wl["mismatches"] = sum(r["mismatches"] for r in runs)
+        wl["runs_wall_s"] = [r["wall_s"] for r in runs]
+        results["workloads"][name] = wl
+        dut._log.info(f"{name}: median {wl['wall_s']:.3f}s of {repeat}, "
+                      f"{wl['cycles']} cycles ({wl['cycles_per_s']:.0f} cycles/s), "
+                      f"sim {wl['sim_s']:.3f}s / python {wl['python_s']:.3f}s, "
+                      f"{wl['mismatches']} mismatches")
+
+    with open(RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=2)
+    with open(HISTORY_FILE, "a") as f:
+        f.write(json.dumps(results) + "\n")
+
+    bad = {n: w["mismatches"] for n, w in results["workloads"].items()
+           if w["mismatches"]}
+    assert not bad, f"HW results differ from reference: {bad}"
+
+    if os.environ.get("BENCH_SAVE_BASELINE", "0") not in ("", "0"):
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        dut._log.info(f"Baseline saved to {BASELINE_FILE}")
+        return
+
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        dut._log.info(f"No {BASELINE_FILE}, skipping comparison")
+        return
+
+    differ = [k for k in SETTINGS if baseline.get(k) != results[k]]
+    if differ:
+        dut._log.warning("Baseline settings differ, skipping comparison: " +
+                         ", ".join(f"{k}={baseline.get(k)} (now {results[k]})"
+                                   for k in differ))
+        return
+
+    tolerance = float(os.environ.get("BENCH_TOLERANCE", 0.2))
+    slow = find_slowdowns(results, baseline, tolerance)
+    for line in slow:
+        dut._log.warning(f"Slower than baseline {baseline.get('commit')}: {line}")
+    assert not slow, f"{len(slow)} benchmark slowdowns vs baseline"
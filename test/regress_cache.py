@@ -0,0 +1,132 @@
+# =========================================================
+# Regression Result Cache
+# =========================================================
+# Remembers which test cases already passed against the current RTL so
+# that `make` only re-simulates cases whose inputs changed.
+#
+# A case key is the hash of:
+#   * the RTL sources and compile defines  (REGRESS_SOURCES / REGRESS_DEFINES)
+#   * the cocotb test module               (name of MODULE and the source
+#                                           of the helpers that drive a case)
+#   * the stimulus of the case             (e.g. matrices A and B)
+#
+# Environment (set from the Makefile / command line):
+#   REGRESS_FORCE=1        ignore cached results, rerun every case
+#                          (also implied when REGRESS_SOURCES is empty)
+#   REGRESS_CACHE_FILE     cache location   (default .regress_cache.json)
+#   REGRESS_CACHE_MAX      LRU size limit   (default 1024 entries)
+import hashlib
+import inspect
+import json
+import os
+import time
+
+DEFAULT_FILE = ".regress_cache.json"
+DEFAULT_MAX  = 1024
+
+
+def _hash_file(h, path):
+    h.update(path.encode())
+    try:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    except OSError:
+        h.update(b"<missing>")
+
+
+def rtl_digest(sources=None, defines=None):
+    """Hash of every Verilog source file plus the compile arguments.
+
+    Returns None if no sources are known, e.g. when not run from the Makefile.
+    """
+    if sources is None:
+        sources = os.environ.get("REGRESS_SOURCES", "").split()
+    if defines is None:
+        defines = os.environ.get("REGRESS_DEFINES", "")
+    if not sources:
+        return None
+    h = hashlib.sha256()
+    for path in sorted(sources):
+        _hash_file(h, path)
+    h.update(defines.encode())
+    return h.hexdigest()
+
+
+def harness_digest(harness):
+    """Hash of the source of each function, or repr of each other value."""
+    h = hashlib.sha256()
+    for item in harness:
+        text = inspect.getsource(item) if callable(item) else repr(item)
+        h.update(text.encode())
+    return h.hexdigest()
+
+
+def _valid_entry(entry):
+    return (isinstance(entry, dict) and
+            isinstance(entry.get("used"), (int, float)) and
+            not isinstance(entry.get("used"), bool))
+
+
+class RegressCache:
+    def __init__(self, module, harness, path=None, max_entries=None, force=None):
+        """`module` is the test module name, `harness` the functions and
+        constants that decide a case's outcome (functions are hashed by source).
+        """
+        self.module = module
+        self.harness = harness_digest(harness)
+        self.path = path or os.environ.get("REGRESS_CACHE_FILE", DEFAULT_FILE)
+        if max_entries is None:
+            max_entries = int(os.environ.get("REGRESS_CACHE_MAX", DEFAULT_MAX))
+        self.max_entries = max_entries
+        if force is None:
+            force = os.environ.get("REGRESS_FORCE", "0") not in ("", "0")
+        self.rtl = rtl_digest()
+        # without RTL in the key a cached pass could hide an RTL change
+        self.force = force or self.rtl is None
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if _valid_entry(v)}
+
+    def key(self, *stimulus):
+        """Cache key for one case; `stimulus` must be JSON serializable."""
+        h = hashlib.sha256()
+        h.update((self.rtl or "").encode())
+        h.update(self.module.encode())
+        h.update(self.harness.encode())
+        h.update(json.dumps(stimulus, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def hit(self, key):
+        """True if the case passed before and may be skipped."""
+        if self.force or key not in self.entries:
+            return False
+        self.entries[key]["used"] = time.time()
+        return True
+
+    def record(self, key, passed):
+        """Store a case outcome; only passing cases are kept."""
+        if self.rtl is None:
+            return
+        if passed:
+            self.entries[key] = {"used": time.time()}
+        else:
+            self.entries.pop(key, None)
+
+    def save(self):
+        # LRU: drop the least recently used entries above the size limit
+        if len(self.entries) > self.max_entries:
+            keep = sorted(self.entries.items(),
+                          key=lambda kv: kv[1]["used"], reverse=True)
+            self.entries = dict(keep[:self.max_entries])
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
@@ -7,11 +7,14 @@
 module tb ();
 
   // Dump the signals to a VCD file. You can view it with gtkwave or surfer.
+  // Define NO_VCD (make VCD=no) to skip the dump, e.g. for benchmarking.
+`ifndef NO_VCD
   initial begin
     $dumpfile("tb.vcd");
     $dumpvars(0, tb);
     #1;
   end
+`endif
 
   // Wire up the inputs and outputs:
   reg clk;
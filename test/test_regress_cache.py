@@ -0,0 +1,99 @@
+# =========================================================
+# Regression Result Cache Test  (pytest, no simulator needed)
+# =========================================================
+import json
+
+import pytest
+
+from regress_cache import RegressCache
+
+
+def helper_a(x):
+    return x + 1
+
+def helper_b(x):
+    return x + 2
+
+
+@pytest.fixture
+def rtl(tmp_path, monkeypatch):
+    src = tmp_path / "top.v"
+    src.write_text("module top; endmodule\n")
+    monkeypatch.setenv("REGRESS_SOURCES", str(src))
+    monkeypatch.setenv("REGRESS_DEFINES", "-I.")
+    monkeypatch.delenv("REGRESS_FORCE", raising=False)
+    return src
+
+
+def make_cache(tmp_path, harness=(helper_a,), **kw):
+    return RegressCache("test", list(harness),
+                        path=str(tmp_path / "cache.json"), **kw)
+
+
+def test_key_stable(rtl, tmp_path):
+    a, b = make_cache(tmp_path), make_cache(tmp_path)
+    assert a.key([[1]], [[2]]) == b.key([[1]], [[2]])
+    assert a.key([[1]], [[2]]) != a.key([[2]], [[1]])
+
+
+def test_key_changes_with_rtl_and_harness(rtl, tmp_path):
+    key = make_cache(tmp_path).key(1)
+    assert make_cache(tmp_path, harness=(helper_b,)).key(1) != key
+    rtl.write_text("module top; wire w; endmodule\n")
+    assert make_cache(tmp_path).key(1) != key
+
+
+def test_hit_record(rtl, tmp_path):
+    cache = make_cache(tmp_path)
+    ok, bad = cache.key(1), cache.key(2)
+    assert not cache.hit(ok)
+    cache.record(ok, True)
+    cache.record(bad, False)
+    cache.save()
+
+    cache = make_cache(tmp_path)
+    assert cache.hit(ok)
+    assert not cache.hit(bad)
+    cache.record(ok, False)
+    assert not cache.hit(ok)
+
+
+def test_lru_eviction(rtl, tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    keys = [cache.key(i) for i in range(3)]
+    for k in keys:
+        cache.record(k, True)
+    cache.entries[keys[0]]["used"] = 3.0   # most recently used
+    cache.entries[keys[1]]["used"] = 1.0   # least recently used
+    cache.entries[keys[2]]["used"] = 2.0
+    cache.save()
+
+    cache = make_cache(tmp_path)
+    assert set(cache.entries) == {keys[0], keys[2]}
+
+
+def test_force(rtl, tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    key = cache.key(1)
+    cache.record(key, True)
+    cache.save()
+
+    assert not make_cache(tmp_path, force=True).hit(key)
+    monkeypatch.setenv("REGRESS_FORCE", "1")
+    assert not make_cache(tmp_path).hit(key)
+
+
+def test_no_sources_disables_cache(rtl, tmp_path, monkeypatch):
+    monkeypatch.setenv("REGRESS_SOURCES", "")
+    cache = make_cache(tmp_path)
+    assert cache.force
+    key = cache.key(1)
+    cache.record(key, True)
+    assert not cache.hit(key)
+    assert cache.entries == {}
+
+
+def test_malformed_entries_dropped(rtl, tmp_path):
+    (tmp_path / "cache.json").write_text(json.dumps(
+        {"a": 1, "b": {"used": "x"}, "c": {"used": True}, "d": {"used": 5}}))
+    assert make_cache(tmp_path).entries == {"d": {"used": 5}}